@@ -1,16 +1,38 @@
+import mmap
+import os
 import struct
 import sys
+import threading
 from dataclasses import dataclass, field
-from typing import Optional, Literal
+from typing import List, Optional, Literal, Set, Tuple, Union
 
 # Standard hex editor row size
 BYTES_PER_ROW = 16
 
+# Files at or above this size are memory-mapped instead of read into a
+# bytearray: pages are faulted in on demand, so opening is O(1) and only
+# the rows actually viewed or edited ever touch memory.
+MMAP_THRESHOLD = 1 << 20  # 1 MiB
+
+# Codepoints that render as themselves in the ASCII pane (space..tilde).
+# Set membership is a single hash lookup per keypress in edit_byte.
+PRINTABLE = frozenset(range(32, 127))
+
+# 256-entry lookup table marking valid hex digit codepoints (both cases),
+# so keypress validation is a single index instead of a substring scan.
+_HEX_LUT = bytes(1 if chr(i) in '0123456789abcdefABCDEF' else 0 for i in range(256))
+
+# Companion table mapping a hex digit codepoint to its nibble value, so
+# combining two nibbles is shift-and-or instead of int(str, 16) parsing.
+_HEX_VAL = bytes(int(chr(i), 16) if _HEX_LUT[i] else 0 for i in range(256))
+
 @dataclass
 class EditorState:
     """Stores the entire state of the hex editor application."""
     filepath: str
-    data: bytearray = field(default_factory=bytearray)
+    # Small files: bytearray. Large files: a copy-on-write mmap, which
+    # supports the same indexing/slicing/assignment the editor relies on.
+    data: Union[bytearray, mmap.mmap] = field(default_factory=bytearray)
     file_size: int = 0
     
     # Cursor and View State
@@ -20,10 +42,27 @@ class EditorState:
     # Editing State
     is_dirty: bool = False
     edit_mode: Literal['hex', 'ascii'] = 'hex'
+
+    # Byte indices modified since the last save. Saves coalesce these into
+    # runs and write only those back, instead of rewriting the whole file.
+    dirty_offsets: Set[int] = field(default_factory=set)
     
     # Hex input buffer: Stores the first nibble (char) while waiting for the second
     hex_input_buffer: Optional[str] = None
 
+    # Monotonic counter bumped on every data mutation, so the renderer can
+    # tell whether any row contents could have changed since the last frame
+    data_version: int = 0
+
+    # Snapshot of the previously rendered frame. draw_screen uses these to
+    # repaint only the regions that differ from the last frame; the initial
+    # sentinel values force a full redraw on the first call.
+    last_scroll_row: int = -1
+    last_cursor_index: int = -1
+    last_hex_buf: Optional[str] = None
+    last_size: Tuple[int, int] = (0, 0)
+    last_data_version: int = -1
+
 
 def load_file(filepath: str) -> EditorState:
     """
@@ -31,14 +70,35 @@ def load_file(filepath: str) -> EditorState:
     Returns an empty state if the file cannot be loaded.
     """
     try:
-        with open(filepath, 'rb') as f:
-            data_bytes = f.read()
-            data_array = bytearray(data_bytes)
-            return EditorState(
-                filepath=filepath,
-                data=data_array,
-                file_size=len(data_array)
-            )
+        fd = os.open(filepath, os.O_RDONLY)
+        try:
+            # Size the buffer up front and read straight into it, instead of
+            # letting f.read() build an intermediate bytes object that then
+            # gets copied into a bytearray.
+            size = os.fstat(fd).st_size
+            if size >= MMAP_THRESHOLD:
+                # Map large files copy-on-write rather than reading them in:
+                # edits stay private to the process until an explicit save,
+                # exactly like the bytearray, but nothing is loaded up front.
+                data_array = mmap.mmap(fd, size, access=mmap.ACCESS_COPY)
+            else:
+                data_array = bytearray(size)
+                view = memoryview(data_array)
+                read_total = 0
+                while read_total < size:
+                    n = os.readv(fd, [view[read_total:]])
+                    if n == 0:
+                        # File shrank between fstat and read; keep what we got
+                        data_array = data_array[:read_total]
+                        break
+                    read_total += n
+        finally:
+            os.close(fd)
+        return EditorState(
+            filepath=filepath,
+            data=data_array,
+            file_size=len(data_array)
+        )
     except FileNotFoundError:
         print(f"Error: File not found at '{filepath}'", file=sys.stderr)
         # Return an initialized state with zero size to prevent AttributeErrors
@@ -48,32 +108,116 @@ def load_file(filepath: str) -> EditorState:
         return EditorState(filepath=filepath)
 
 
-def save_file(state: EditorState) -> None:
+# The single in-flight background save, if any. save_file joins it before
+# starting the next one so writes reach the file in order.
+_save_thread: Optional[threading.Thread] = None
+
+# Scatter-write geometry for the background saver: each os.writev call
+# submits up to _WRITEV_IOVCNT chunk views of _WRITE_CHUNK bytes each,
+# staying comfortably under the kernel's IOV_MAX.
+_WRITE_CHUNK = 1 << 20  # 1 MiB
+_WRITEV_IOVCNT = 64
+
+
+def _coalesce_dirty_runs(state: EditorState) -> List[Tuple[int, bytes]]:
     """
-    Writes the current data buffer (bytearray) back to the file specified
-    in state.filepath. Resets the dirty flag upon successful write.
+    Collapses state.dirty_offsets into (offset, payload) runs of contiguous
+    modified bytes, snapshotting the payloads out of the data buffer.
+    """
+    runs = []
+    start = prev = None
+    for off in sorted(state.dirty_offsets):
+        if start is None:
+            start = prev = off
+        elif off == prev + 1:
+            prev = off
+        else:
+            runs.append((start, bytes(state.data[start:prev + 1])))
+            start = prev = off
+    if start is not None:
+        runs.append((start, bytes(state.data[start:prev + 1])))
+    return runs
+
+
+def _write_runs(state: EditorState, runs: List[Tuple[int, bytes]]) -> None:
+    """
+    Worker body for the background save: writes each run of modified bytes
+    to its offset in state.filepath. Runs off the main thread so the UI
+    never stalls on disk. Payloads go out via positioned scatter writes
+    (os.pwritev over memoryview chunks), so nothing is re-copied between
+    the snapshot and the kernel.
     """
     try:
-        if not state.filepath:
-            print("Error: Cannot save, no filepath defined.", file=sys.stderr)
-            return
-
-        # Open file in binary write mode ('wb') and overwrite the contents
-        with open(state.filepath, 'wb') as f:
-            f.write(state.data)
-        
-        # If writing succeeds, the buffer is no longer dirty
-        state.is_dirty = False
-        # Note: In a real app, you would add a status message here ("File saved!")
+        # The file is opened in place, never truncated: the editor cannot
+        # change the file size, every unmodified byte is already on disk,
+        # and a copy-on-write mmap of this same file must stay valid.
+        fd = os.open(state.filepath, os.O_WRONLY)
+        try:
+            for offset, payload in runs:
+                view = memoryview(payload)
+                total = len(view)
+                written = 0
+                while written < total:
+                    # Rebuilt from `written` each pass, so a short write
+                    # simply resumes where the kernel stopped
+                    batch_end = min(written + _WRITE_CHUNK * _WRITEV_IOVCNT, total)
+                    chunks = [view[i:i + _WRITE_CHUNK]
+                              for i in range(written, batch_end, _WRITE_CHUNK)]
+                    written += os.pwritev(fd, chunks, offset + written)
+        finally:
+            os.close(fd)
 
     except Exception as e:
-        # If an error occurs (e.g., permissions), print it but keep the dirty flag True
+        # If an error occurs (e.g., permissions), print it and restore the
+        # dirty bookkeeping so the user knows the edits never reached the
+        # disk and the next save retries them
+        for offset, payload in runs:
+            state.dirty_offsets.update(range(offset, offset + len(payload)))
+        state.is_dirty = True
         print(f"Error saving file '{state.filepath}': {e}", file=sys.stderr)
 
 
-def edit_byte(state: EditorState, char_input: str) -> bool:
+def save_file(state: EditorState) -> None:
+    """
+    Writes the bytes modified since the last save back to state.filepath.
+    Only the dirty runs are written - unmodified bytes are already on disk,
+    so saving after a few edits costs a handful of positioned writes no
+    matter how large the file is. The writes happen on a background thread
+    against snapshots of the runs, so the main loop returns to handling
+    keys immediately. Resets the dirty flag up front; a failed write
+    restores it.
     """
-    Modifies the byte at the current cursor_index based on the input character
+    global _save_thread
+
+    if not state.filepath:
+        print("Error: Cannot save, no filepath defined.", file=sys.stderr)
+        return
+
+    # Keep saves ordered: wait out any write that is still in flight
+    if _save_thread is not None and _save_thread.is_alive():
+        _save_thread.join()
+
+    # Snapshot the dirty runs on the main thread, so edits made while the
+    # write is in flight cannot tear them; those edits re-mark the state
+    # dirty and are picked up by the next save.
+    runs = _coalesce_dirty_runs(state)
+    state.dirty_offsets.clear()
+    state.is_dirty = False
+    if not runs:
+        return
+
+    # Non-daemon so the interpreter waits for the write even if the user
+    # quits the instant after saving
+    _save_thread = threading.Thread(
+        target=_write_runs, args=(state, runs), name="save-writer"
+    )
+    _save_thread.start()
+
+
+def edit_byte(state: EditorState, key: int) -> bool:
+    """
+    Modifies the byte at the current cursor_index based on the pressed key
+    (the integer keycode straight from getch(), no chr()/ord() round-trip)
     and the current edit mode (hex or ascii). Handles hex nibble-level input.
 
     Returns:
@@ -83,42 +227,44 @@ def edit_byte(state: EditorState, char_input: str) -> bool:
     if state.file_size == 0 or state.cursor_index >= state.file_size:
         return False
     if state.edit_mode == 'hex':
-        char_input = char_input.lower()
-    
-    if state.edit_mode == 'hex':
-        if char_input in '0123456789abcdef':
+        if _HEX_LUT[key]:
             if state.hex_input_buffer is None:
                 # 1. First nibble received (half-edit)
-                state.hex_input_buffer = char_input
+                # Kept as a character: the renderer displays it directly
+                state.hex_input_buffer = chr(key)
                 # Return False as the byte isn't fully changed yet (only visual)
-                return False 
+                return False
             else:
                 # 2. Second nibble received: Complete the byte
-                
+
                 # Combine nibbles (e.g., 'a' and 'f' -> 0xAF)
-                byte_str = state.hex_input_buffer + char_input
-                new_byte_value = int(byte_str, 16)
-                
+                high = _HEX_VAL[ord(state.hex_input_buffer)]
+                new_byte_value = (high << 4) | _HEX_VAL[key]
+
                 # Apply the change
                 state.data[state.cursor_index] = new_byte_value
                 state.is_dirty = True
+                state.data_version += 1
+                state.dirty_offsets.add(state.cursor_index)
                 state.hex_input_buffer = None
-                
+
                 # Move cursor to the next byte
                 state.cursor_index = min(state.cursor_index + 1, state.file_size - 1)
-                
+
                 return True # State modified, screen needs redraw
-    
+
     elif state.edit_mode == 'ascii':
         # Check for printable ASCII (32 to 126)
-        if 32 <= ord(char_input) <= 126:
+        if key in PRINTABLE:
             # Apply the change
-            state.data[state.cursor_index] = ord(char_input)
+            state.data[state.cursor_index] = key
             state.is_dirty = True
-            
+            state.data_version += 1
+            state.dirty_offsets.add(state.cursor_index)
+
             # Move cursor to the next byte
             state.cursor_index = min(state.cursor_index + 1, state.file_size - 1)
-            
+
             # Clear hex buffer just in case the user switched modes mid-nibble
             state.hex_input_buffer = None
             return True # State modified, screen needs redraw
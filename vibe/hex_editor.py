@@ -2,7 +2,7 @@ import curses
 import sys
 import os
 from editor_state import load_file, save_file, EditorState
-from tui_handler import init_tui, draw_screen, position_cursor, handle_keypress
+from tui_handler import init_tui, draw_screen, position_cursor, handle_keypress, Command
 
 def quit_prompt(stdscr: 'curses._CursesWindow', state: EditorState) -> bool:
     """
@@ -26,17 +26,15 @@ def quit_prompt(stdscr: 'curses._CursesWindow', state: EditorState) -> bool:
     stdscr.chgat(status_y, len(prompt_msg), max_x - len(prompt_msg), prompt_color)
     stdscr.refresh()
 
-    # CRITICAL FIX: Temporarily set timeout to -1 (blocking) so getch waits indefinitely.
-    stdscr.timeout(-1) 
-
-    # 2. Wait for confirmation key
+    # 2. Wait for confirmation key (getch is already blocking; the main
+    # loop runs with an infinite timeout)
     key = stdscr.getch()
-    
+
     # 3. Redraw the screen to clear the prompt, regardless of outcome
-    # The main loop will automatically restore the stdscr.timeout(100) on the next iteration.
-    draw_screen(stdscr, state) 
+    draw_screen(stdscr, state)
     position_cursor(stdscr, state)
-    stdscr.refresh()
+    stdscr.noutrefresh()
+    curses.doupdate()
     
     # 4. Check for confirmation (y or Y)
     if key in (ord('y'), ord('Y')):
@@ -60,25 +58,38 @@ def main(stdscr: 'curses._CursesWindow', filepath: str) -> None:
     # Initial draw
     draw_screen(stdscr, state)
     position_cursor(stdscr, state)
-    stdscr.refresh()
+    stdscr.noutrefresh()
+    curses.doupdate()
     
+    # Block in getch() until a key actually arrives: nothing in the editor
+    # redraws without input, and curses delivers KEY_RESIZE for window
+    # changes, so the old 100 ms wakeup loop was pure idle churn.
+    stdscr.timeout(-1)
+
     # 2. Main Loop
     while True:
         try:
             # 2.1 Handle Input
-            # Set a timeout for getch() so we can redraw occasionally (if needed)
-            stdscr.timeout(100) 
             key = stdscr.getch()
-            
-            # If nothing was pressed, continue the loop
+
+            # getch can still return ERR if the wait was interrupted
             if key == -1:
                 continue
 
+            # Window resized: let draw_screen notice the new size and do a
+            # full repaint
+            if key == curses.KEY_RESIZE:
+                draw_screen(stdscr, state)
+                position_cursor(stdscr, state)
+                stdscr.noutrefresh()
+                curses.doupdate()
+                continue
+
             command = handle_keypress(key, state)
             
             # 2.2 Process Command
             
-            if command == 'QUIT':
+            if command == Command.QUIT:
                 # Check for dirty flag and prompt user before quitting
                 if quit_prompt(stdscr, state):
                     break
@@ -86,15 +97,19 @@ def main(stdscr: 'curses._CursesWindow', filepath: str) -> None:
                     # If quit is cancelled, continue the loop without redrawing here
                     continue
             
-            # Action: Call save_file when Ctrl+X (command 'SAVE') is detected
-            if command == 'SAVE':
+            # Action: Call save_file when Ctrl+W (Command.SAVE) is detected
+            if command == Command.SAVE:
                 save_file(state)
             
-            # Only redraw the screen if a command that changes state/view was executed
-            if command in ('EDIT', 'MOVE', 'MODE_CHANGE', 'HALF_EDIT', 'SAVE'):
+            # Only redraw the screen if a command that changes state/view was
+            # executed (every command except NO_OP; QUIT was handled above)
+            if command != Command.NO_OP:
                 draw_screen(stdscr, state)
                 position_cursor(stdscr, state)
-                stdscr.refresh()
+                # Queue the frame on the virtual screen and flush once;
+                # doupdate only emits the cells that differ physically
+                stdscr.noutrefresh()
+                curses.doupdate()
                 
         except curses.error as e:
             # Handle resizing or other curses errors gracefully
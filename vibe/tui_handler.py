@@ -1,12 +1,69 @@
 import curses
 import curses.ascii
-from editor_state import EditorState, BYTES_PER_ROW, edit_byte
+from enum import IntEnum
+from editor_state import EditorState, BYTES_PER_ROW, edit_byte, _HEX_LUT
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     # Used for type hinting the curses object without importing it at runtime
     pass
 
+
+class Command(IntEnum):
+    """
+    Result of handle_keypress. The main loop dispatches on these; integer
+    comparisons replace the string compares used previously.
+    """
+    NO_OP = 0
+    MOVE = 1
+    EDIT = 2
+    HALF_EDIT = 3
+    MODE_CHANGE = 4
+    SAVE = 5
+    QUIT = 6
+
+# --- Render Lookup Tables ---
+
+# Precomputed hex strings for every possible byte value, so the render loop
+# does an index lookup instead of an f-string format per byte.
+HEX_TABLE = tuple(f"{i:02X}" for i in range(256))
+
+# The same cells as 3-byte chunks ("XX ") for splicing into the row scratch
+HEX_CELL = tuple(f"{i:02X} ".encode('ascii') for i in range(256))
+
+
+# Translation table mapping non-printable bytes to '.' for the ASCII pane.
+# Applied to a whole row at once with bytes.translate().
+ASCII_TRANS = bytes.maketrans(
+    bytes(range(256)),
+    bytes(i if 32 <= i <= 126 else 0x2E for i in range(256))
+)
+
+# Fixed column layout, computed once at import time: the x origin of each
+# pane and the x position of every byte's hex / ASCII cell within a row.
+HEX_PANE_X = 10
+ASCII_PANE_X = HEX_PANE_X + (BYTES_PER_ROW * 3) + 2
+HEX_COL = tuple(HEX_PANE_X + (i * 3) for i in range(BYTES_PER_ROW))
+ASCII_COL = tuple(ASCII_PANE_X + i for i in range(BYTES_PER_ROW))
+
+# Reusable scratch buffer a whole display row (offset column, hex pane,
+# ASCII pane) is assembled in. Splicing cells into it avoids per-row list +
+# join allocations, and the pre-set spaces provide the inter-pane gaps.
+_ROW_SCRATCH = bytearray(b" " * (ASCII_PANE_X + BYTES_PER_ROW))
+
+# Offset-column labels ("00000010:"), grown on demand by _offset_label.
+# Scrolling re-renders the same offsets over and over; after the first
+# visit each label is a plain list lookup instead of a bytes format.
+_OFFSET_CACHE: list = []
+
+
+def _offset_label(data_row_index: int, _cache=_OFFSET_CACHE) -> bytes:
+    """Returns the 9-byte offset label for a row, extending the cache on
+    first visit."""
+    while len(_cache) <= data_row_index:
+        _cache.append(b"%08X:" % (len(_cache) * BYTES_PER_ROW))
+    return _cache[data_row_index]
+
 # --- Display Functions ---
 
 def init_tui(stdscr: 'curses._CursesWindow') -> None:
@@ -19,7 +76,11 @@ def init_tui(stdscr: 'curses._CursesWindow') -> None:
     """
     # Turn off cursor blinking (optional, but nicer)
     curses.curs_set(1)
-    
+
+    # Raw mode: control keys (Ctrl+W save, Ctrl+X quit) reach getch() as
+    # plain keycodes instead of being interpreted by the terminal driver
+    curses.raw()
+
     # Enable color
     if curses.has_colors():
         curses.start_color()
@@ -34,33 +95,172 @@ def init_tui(stdscr: 'curses._CursesWindow') -> None:
         curses.init_pair(4, curses.COLOR_WHITE, curses.COLOR_BLUE)
 
 
+def _draw_header(stdscr: 'curses._CursesWindow', state: EditorState, max_x: int) -> None:
+    """Paints the header line (filename and file size) at the top of the screen."""
+    header = f" {state.filepath} | F-size: {state.file_size} bytes "
+    stdscr.addstr(0, 0, header, curses.color_pair(2) | curses.A_BOLD)
+    # Fill remaining space with padding using the header color
+    stdscr.chgat(0, len(header), max_x - len(header), curses.color_pair(2))
+
+
+def _draw_status(stdscr: 'curses._CursesWindow', state: EditorState, max_y: int) -> None:
+    """Paints the status line (mode, cursor position, dirty flag) at the bottom."""
+    status_y = max_y - 1
+
+    # Mode info
+    mode_str = f" Mode: {state.edit_mode.upper()} "
+
+    # Cursor info
+    cursor_info = f" Pos: {state.cursor_index:08X} (dec: {state.cursor_index}) "
+
+    # Dirty status
+    dirty_str = " MODIFIED " if state.is_dirty else " CLEAN "
+    dirty_color = curses.color_pair(4) if state.is_dirty else curses.color_pair(1)
+
+    # Combine status parts (trailing space separates the dirty indicator)
+    status_line = mode_str + cursor_info + " "
+
+    stdscr.addstr(status_y, 0, status_line, curses.color_pair(1))
+    stdscr.addstr(status_y, len(status_line), dirty_str, dirty_color | curses.A_BOLD)
+    # Clear any leftovers from a longer previous status (e.g. the quit prompt)
+    stdscr.clrtoeol()
+
+
+def _format_row(data_row_index: int, row_bytes: memoryview,
+                _cells=HEX_CELL, _scratch=_ROW_SCRATCH) -> bytes:
+    """
+    Formats one full display row ("00000010:  AB CD ...  ascii") into the
+    pooled scratch buffer and returns it as bytes. The lookup table and
+    scratch buffer are bound as defaults so the hot loop runs entirely on
+    local-variable loads.
+    """
+    _scratch[0:9] = _offset_label(data_row_index)
+
+    pos = HEX_PANE_X
+    for b in row_bytes:
+        _scratch[pos:pos + 3] = _cells[b]
+        pos += 3
+
+    n = len(row_bytes)
+    if n < BYTES_PER_ROW:
+        # Short final row: blank the hex cells left over from the last use
+        end = HEX_PANE_X + (BYTES_PER_ROW * 3)
+        _scratch[pos:end] = b" " * (end - pos)
+
+    _scratch[ASCII_PANE_X:ASCII_PANE_X + n] = bytes(row_bytes).translate(ASCII_TRANS)
+    return bytes(memoryview(_scratch)[:ASCII_PANE_X + n])
+
+
+def _draw_row(stdscr: 'curses._CursesWindow', state: EditorState, data_view: memoryview,
+              screen_row: int, data_row_index: int) -> None:
+    """Paints one data row (offset column, hex pane, ASCII pane) and, if the
+    cursor sits on it, the cursor highlight."""
+    # Calculate the starting index for this row's data
+    row_start_index = data_row_index * BYTES_PER_ROW
+
+    # Emit the whole row (offset, hex pane, ASCII pane) as one aggregated
+    # write, then apply the offset column's dim attribute as a run on top.
+    # Slicing the memoryview avoids copying the row out of the buffer.
+    row_bytes = data_view[row_start_index:row_start_index + BYTES_PER_ROW]
+    stdscr.addstr(screen_row, 0, _format_row(data_row_index, row_bytes),
+                  curses.color_pair(1))
+    stdscr.chgat(screen_row, 0, 9, curses.A_DIM)
+
+    # Overlay the cursor highlight if the cursor sits on this row
+    if row_start_index <= state.cursor_index < row_start_index + len(row_bytes):
+        _paint_cursor_cell(stdscr, state, state.cursor_index, highlighted=True)
+
+
+def _make_cursor_painter(mode: str):
+    """
+    Builds the cursor-cell painter specialized for one edit mode. Built once
+    at import time, so the hex variant bakes in the half-edit overlay logic
+    while the ascii variant skips that test on every paint; the per-call
+    mode dispatch collapses to a dict lookup in _paint_cursor_cell.
+    """
+    hex_mode = (mode == 'hex')
+
+    def painter(stdscr: 'curses._CursesWindow', state: EditorState,
+                byte_index: int, highlighted: bool) -> None:
+        if byte_index < 0 or byte_index >= state.file_size:
+            return
+
+        # Locate the byte on screen; skip silently if it is not visible
+        screen_row = (byte_index // BYTES_PER_ROW) - state.scroll_row + 1
+        if not 1 <= screen_row < stdscr.getmaxyx()[0] - 1:
+            return
+
+        cursor_col = byte_index % BYTES_PER_ROW
+        hex_x = HEX_COL[cursor_col]
+        ascii_x = ASCII_COL[cursor_col]
+
+        if highlighted:
+            byte_color = curses.color_pair(3) | curses.A_BOLD
+        else:
+            byte_color = curses.color_pair(1)
+
+        # Always rewrite the cell text, not just its attributes: the cell may
+        # show a stale half-edit nibble or the pre-edit value of a just-edited
+        # byte. Two tiny addstr calls cost the same as the chgat they replace.
+        byte_val = state.data[byte_index]
+        if hex_mode and highlighted and state.hex_input_buffer is not None:
+            # Half-edited hex byte: first nibble from the input buffer,
+            # second from the original data
+            display_hex_value = state.hex_input_buffer.upper() + HEX_TABLE[byte_val][1]
+            stdscr.addstr(screen_row, hex_x, display_hex_value, byte_color)
+        else:
+            stdscr.addstr(screen_row, hex_x, HEX_TABLE[byte_val], byte_color)
+
+        # ASCII_TRANS doubles as the printable-char mapping for a single byte
+        stdscr.addstr(screen_row, ascii_x, chr(ASCII_TRANS[byte_val]), byte_color)
+
+    return painter
+
+
+# Per-mode painters, specialized once at import
+_CURSOR_PAINTERS = {mode: _make_cursor_painter(mode) for mode in ('hex', 'ascii')}
+
+
+def _paint_cursor_cell(stdscr: 'curses._CursesWindow', state: EditorState,
+                       byte_index: int, highlighted: bool) -> None:
+    """
+    Repaints the hex and ASCII cells for a single byte, with or without the
+    cursor highlight, via the painter specialized for the current edit mode.
+    Used by the partial-redraw paths in draw_screen to move the highlight
+    without touching the rest of the frame.
+    """
+    _CURSOR_PAINTERS[state.edit_mode](stdscr, state, byte_index, highlighted)
+
+
+def _remember_frame(state: EditorState, max_y: int, max_x: int) -> None:
+    """Records the frame that was just rendered, for the next diff redraw."""
+    state.last_scroll_row = state.scroll_row
+    state.last_cursor_index = state.cursor_index
+    state.last_hex_buf = state.hex_input_buffer
+    state.last_size = (max_y, max_x)
+    state.last_data_version = state.data_version
+
+
 def draw_screen(stdscr: 'curses._CursesWindow', state: EditorState) -> None:
     """
-    The core rendering function. It completely redraws the hex editor 
-    display (offset column, hex pane, ASCII pane) based on the current state.
-    
+    The core rendering function. It redraws the hex editor display (offset
+    column, hex pane, ASCII pane) based on the current state. Rather than
+    clearing and repainting everything, it diffs against the previously
+    rendered frame and only repaints what changed: a plain cursor move just
+    moves the highlight, a scroll shifts the window and paints the newly
+    exposed rows, and only data loads / resizes force a full repaint.
+
     Args:
         stdscr: The main screen object.
         state: The current EditorState object.
     """
-    # Clear the screen at the start of every draw cycle
-    stdscr.clear()
-    
     # Get screen dimensions
     max_y, max_x = stdscr.getmaxyx()
     display_rows = max_y - 2  # Leave space for header and status line
 
-    # --- 1. RENDER HEADER LINE ---
-    header = f" {state.filepath} | F-size: {state.file_size} bytes "
-    stdscr.addstr(0, 0, header, curses.color_pair(2) | curses.A_BOLD)
-    # Fill remaining space with padding using the header color
-    stdscr.chgat(0, len(header), max_x - len(header), curses.color_pair(2))
-
     # Calculate total rows needed for the file content
     total_file_rows = (state.file_size + BYTES_PER_ROW - 1) // BYTES_PER_ROW
 
-    # --- 2. RENDER HEX AND ASCII PANES ---
-    
     # Ensure scroll_row is within valid bounds
     if state.scroll_row > total_file_rows - display_rows:
         state.scroll_row = max(0, total_file_rows - display_rows)
@@ -74,95 +274,74 @@ def draw_screen(stdscr: 'curses._CursesWindow', state: EditorState) -> None:
     elif cursor_row_index >= state.scroll_row + display_rows:
         state.scroll_row = cursor_row_index - display_rows + 1
 
-    
+    scroll_delta = state.scroll_row - state.last_scroll_row
+    data_delta = state.data_version - state.last_data_version
+
+    # --- PARTIAL REDRAW PATHS ---
+    # Taken when the window size is unchanged and the data is either
+    # untouched or exactly one byte was edited since the last frame. A
+    # single edit always lands at the previous cursor position, and the
+    # cursor-cell repaints below rewrite that cell's text, so nothing else
+    # on screen can be stale.
+    if (max_y, max_x) == state.last_size and data_delta in (0, 1):
+
+        if scroll_delta == 0:
+            # Fast path: only the cursor and/or the pending nibble moved.
+            # Restore the old cursor cell, highlight the new one.
+            _paint_cursor_cell(stdscr, state, state.last_cursor_index, highlighted=False)
+            _paint_cursor_cell(stdscr, state, state.cursor_index, highlighted=True)
+            _draw_status(stdscr, state, max_y)
+            _remember_frame(state, max_y, max_x)
+            return
+
+        if abs(scroll_delta) < display_rows:
+            # Scroll path: shift the content region and paint only the rows
+            # that scrolled into view. The header and status line are kept
+            # out of the scrolling region.
+            stdscr.setscrreg(1, max_y - 2)
+            stdscr.scrollok(True)
+            stdscr.scroll(scroll_delta)
+            stdscr.scrollok(False)
+
+            if scroll_delta > 0:
+                exposed = range(max_y - 1 - scroll_delta, max_y - 1)
+            else:
+                exposed = range(1, 1 - scroll_delta)
+            data_view = memoryview(state.data)
+            for screen_row in exposed:
+                data_row_index = state.scroll_row + (screen_row - 1)
+                if data_row_index * BYTES_PER_ROW < state.file_size:
+                    _draw_row(stdscr, state, data_view, screen_row, data_row_index)
+
+            # The old highlight scrolled along with its row; clear it at its
+            # shifted position, then highlight the new cursor cell.
+            _paint_cursor_cell(stdscr, state, state.last_cursor_index, highlighted=False)
+            _paint_cursor_cell(stdscr, state, state.cursor_index, highlighted=True)
+            _draw_status(stdscr, state, max_y)
+            _remember_frame(state, max_y, max_x)
+            return
+
+    # --- FULL REDRAW ---
+    # erase() only blanks the virtual screen; unlike clear() it does not set
+    # clearok, so curses still diffs against the physical screen on update
+    # and repaints only the cells that really changed.
+    stdscr.erase()
+    _draw_header(stdscr, state, max_x)
+
+    # One view over the whole buffer for the frame; rows slice it for free
+    data_view = memoryview(state.data)
+
     for screen_row in range(1, max_y - 1): # Start at y=1 (below header)
         data_row_index = state.scroll_row + (screen_row - 1)
-        
+
         # Check if we are past the end of the file data
         if data_row_index * BYTES_PER_ROW >= state.file_size:
             break
-        
-        # Calculate the starting index for this row's data
-        row_start_index = data_row_index * BYTES_PER_ROW
-        
-        # --- OFFSET COLUMN (0x00000000) ---
-        offset_str = f"{row_start_index:08X}:"
-        stdscr.addstr(screen_row, 0, offset_str, curses.A_DIM)
-
-        # Start position for hex content after offset
-        hex_x = 10 
-        # Calculate start of ASCII pane
-        ascii_x = hex_x + (BYTES_PER_ROW * 3) + 2 
-
-        # Process the 16 bytes for this row
-        for i in range(BYTES_PER_ROW):
-            current_byte_index = row_start_index + i
-            
-            # Draw content or padding
-            if current_byte_index < state.file_size:
-                byte_val = state.data[current_byte_index]
-                
-                # A. Hex Representation
-                hex_value = f"{byte_val:02X}"
-                
-                # B. ASCII Representation
-                if 32 <= byte_val <= 126:
-                    ascii_char = chr(byte_val)
-                else:
-                    ascii_char = '.'
-                
-                # C. Check for cursor highlight
-                if current_byte_index == state.cursor_index:
-                    # Cursor is here: use highlight color
-                    byte_color = curses.color_pair(3) | curses.A_BOLD
-                else:
-                    # No cursor: use normal color
-                    byte_color = curses.color_pair(1)
-                
-                # Draw the hex byte
-                hex_byte_x = hex_x + (i * 3) 
-                
-                # Special rendering for half-edited hex byte
-                if state.edit_mode == 'hex' and current_byte_index == state.cursor_index and state.hex_input_buffer is not None:
-                    # Draw the first nibble from the buffer, the second from the original data
-                    display_hex_value = state.hex_input_buffer.upper() + hex_value[1] 
-                    stdscr.addstr(screen_row, hex_byte_x, display_hex_value, byte_color)
-                else:
-                    stdscr.addstr(screen_row, hex_byte_x, hex_value, byte_color)
-                    
-                # Draw the ascii character
-                ascii_byte_x = ascii_x + i
-                stdscr.addstr(screen_row, ascii_byte_x, ascii_char, byte_color)
-                
-            else:
-                # Padding for end-of-file
-                hex_byte_x = hex_x + (i * 3)
-                stdscr.addstr(screen_row, hex_byte_x, "  ")
-                ascii_byte_x = ascii_x + i
-                stdscr.addstr(screen_row, ascii_byte_x, " ")
-        
-    # --- 3. RENDER STATUS LINE ---
-    status_y = max_y - 1
-    
-    # Mode info
-    mode_str = f" Mode: {state.edit_mode.upper()} "
-    
-    # Cursor info
-    cursor_info = f" Pos: {state.cursor_index:08X} (dec: {state.cursor_index}) "
-    
-    # Dirty status
-    dirty_str = " MODIFIED " if state.is_dirty else " CLEAN "
-    dirty_color = curses.color_pair(4) if state.is_dirty else curses.color_pair(1)
 
-    # Combine status parts
-    status_line = mode_str + cursor_info
-    
-    stdscr.addstr(status_y, 0, status_line)
-    stdscr.addstr(status_y, len(status_line) + 1, dirty_str, dirty_color | curses.A_BOLD)
-    
-    # Pad the rest of the line and ensure color
-    stdscr.chgat(status_y, 0, max_x, curses.color_pair(1)) 
-    stdscr.addstr(status_y, 0, status_line + dirty_str) 
+        _draw_row(stdscr, state, data_view, screen_row, data_row_index)
+
+    _draw_status(stdscr, state, max_y)
+    _remember_frame(state, max_y, max_x)
 
 
 def position_cursor(stdscr: 'curses._CursesWindow', state: EditorState) -> None:
@@ -183,20 +362,16 @@ def position_cursor(stdscr: 'curses._CursesWindow', state: EditorState) -> None:
     
     if screen_row >= 1 and screen_row < stdscr.getmaxyx()[0] - 1:
         byte_in_row = state.cursor_index % BYTES_PER_ROW
-        
-        hex_x_offset = 10 
-        ascii_x_offset = hex_x_offset + (BYTES_PER_ROW * 3) + 2
 
         if state.edit_mode == 'hex':
             # Hex mode: cursor position is at the first nibble of the byte
-            # Column: 10 + (byte_in_row * 3)
             # Use 1 if hex_input_buffer is active (second nibble input)
-            target_x = hex_x_offset + (byte_in_row * 3) + (1 if state.hex_input_buffer else 0)
-            
+            target_x = HEX_COL[byte_in_row] + (1 if state.hex_input_buffer else 0)
+
         elif state.edit_mode == 'ascii':
             # ASCII mode: cursor position is exactly on the character
-            target_x = ascii_x_offset + byte_in_row
-            
+            target_x = ASCII_COL[byte_in_row]
+
         else:
             # Fallback
             target_x = 0
@@ -210,87 +385,84 @@ def position_cursor(stdscr: 'curses._CursesWindow', state: EditorState) -> None:
 
 # --- Input Functions ---
 
-def handle_keypress(key: int, state: EditorState) -> str:
+def handle_keypress(key: int, state: EditorState) -> Command:
     """
-    Processes a single keypress, handles movement, mode switching, 
+    Processes a single keypress, handles movement, mode switching,
     save/quit commands, and relays edit characters to edit_byte().
 
-    Returns the command executed, e.g., 'QUIT', 'SAVE', 'EDIT', 'MOVE', 'HALF_EDIT', 'NO_OP'.
+    Returns the Command executed, e.g. Command.QUIT, Command.SAVE,
+    Command.EDIT, Command.MOVE, Command.HALF_EDIT or Command.NO_OP.
 
     Args:
         key: The integer representation of the key pressed (from stdscr.getch()).
         state: The current EditorState object (modified in-place by movement/edits).
     """
-    
+
     if state.file_size == 0:
         # Only allow quit if the file is empty
         if key in (ord('q'), 17):
-            return 'QUIT'
-        return 'NO_OP'
+            return Command.QUIT
+        return Command.NO_OP
 
     # --- Command Handling ---
-    
+
     # SAVE Command (Ctrl+W)
     if key == 23: # 23 is Ctrl+W
-        return 'SAVE' 
-    
-    # QUIT Command (Ctrl+X) 
+        return Command.SAVE
+
+    # QUIT Command (Ctrl+X)
     if key == 24: # 24 is Ctrl+X
-        return 'QUIT' 
+        return Command.QUIT
 
     # Mode Toggle (Tab key)
     if key == ord('\t'):
         state.edit_mode = 'ascii' if state.edit_mode == 'hex' else 'hex'
         state.hex_input_buffer = None # Clear buffer on mode switch
-        return 'MODE_CHANGE'
+        return Command.MODE_CHANGE
 
     # --- Editing Logic ---
-    # Check if the key is a printable ASCII character
+    # Check if the key is a printable ASCII character; edit_byte takes the
+    # integer keycode directly, so no chr() conversion is needed here
     if curses.ascii.isprint(key):
-        char_input = chr(key)
-        
         if state.edit_mode == 'hex':
-            # Hex mode: only accept valid hex digits
-            if char_input.lower() in '0123456789abcdef':
-                # Call the new edit_byte function
-                if edit_byte(state, char_input):
-                    return 'EDIT'      # Full byte edit complete
+            # Hex mode: only accept valid hex digits (O(1) table lookup)
+            if _HEX_LUT[key]:
+                if edit_byte(state, key):
+                    return Command.EDIT      # Full byte edit complete
                 else:
-                    return 'HALF_EDIT' # First nibble input
-        
+                    return Command.HALF_EDIT # First nibble input
+
         elif state.edit_mode == 'ascii':
             # ASCII mode: accept any printable character (checked above)
-            # Call the new edit_byte function
-            if edit_byte(state, char_input):
-                return 'EDIT' # Full byte edit complete
-        
+            if edit_byte(state, key):
+                return Command.EDIT # Full byte edit complete
+
     # --- Movement Logic (Arrow Keys) ---
     new_index = state.cursor_index
-    command = 'NO_OP'
+    command = Command.NO_OP
 
     if key == curses.KEY_LEFT:
         new_index = state.cursor_index - 1
-        command = 'MOVE'
+        command = Command.MOVE
     elif key == curses.KEY_RIGHT:
         new_index = state.cursor_index + 1
-        command = 'MOVE'
+        command = Command.MOVE
     elif key == curses.KEY_UP:
         new_index = state.cursor_index - BYTES_PER_ROW
-        command = 'MOVE'
+        command = Command.MOVE
     elif key == curses.KEY_DOWN:
         new_index = state.cursor_index + BYTES_PER_ROW
-        command = 'MOVE'
+        command = Command.MOVE
 
     # --- Clamping and Index Update ---
-    if command == 'MOVE':
+    if command == Command.MOVE:
         # Clamp the new index to be within [0, file_size - 1]
         new_index = max(0, min(new_index, state.file_size - 1))
-        
+
         if new_index != state.cursor_index:
             state.cursor_index = new_index
             # When cursor moves, clear any pending hex input
             state.hex_input_buffer = None
-            return 'MOVE' # Return MOVE if the cursor actually changed position
+            return Command.MOVE # Return MOVE if the cursor actually changed position
 
-    return 'NO_OP'
-    
\ No newline at end of file
+    return Command.NO_OP